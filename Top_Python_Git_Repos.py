@@ -1,18 +1,17 @@
 # python_top_repos.py
 
 import streamlit as st
-import requests
+import httpx
+import re
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from typing import Optional
 
-# ------------------------------------------------------
-# PAGE CONFIG
-# ------------------------------------------------------
-st.set_page_config(page_title="Top Python Repos", layout="wide")
-
 # ------------------------------------------------------
 # CUSTOM CSS FOR BLUE BACKGROUND + TILES
 # ------------------------------------------------------
-st.markdown("""
+_CSS_SOURCE = """
 <style>
 
     /* Force entire background blue */
@@ -85,21 +84,30 @@ st.markdown("""
     }
 
 </style>
-""", unsafe_allow_html=True)
+"""
 
-# ------------------------------------------------------
-# HEADER
-# ------------------------------------------------------
-st.markdown("<h1>Top Curated Python Repos for Developers</h1>", unsafe_allow_html=True)
-st.markdown(
-    '<div class="subtitle">Handpicked list of trending Python projects on GitHub.</div>',
-    unsafe_allow_html=True
-)
+# The <style> block is re-sent on every rerun, so minify it to keep that payload small
+@st.cache_resource
+def minified_css():
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", re.sub(r"/\*.*?\*/|\s+", " ", _CSS_SOURCE, flags=re.S)).strip()
 
 # ------------------------------------------------------
 # GITHUB API
 # ------------------------------------------------------
 GITHUB_SEARCH_URL = "https://api.github.com/search/repositories"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+GITHUB_RATE_LIMIT_URL = "https://api.github.com/rate_limit"
+
+# Ask GraphQL for exactly the four fields the tiles render
+TOP_REPOS_QUERY = """
+query($q: String!, $n: Int!) {
+  search(query: $q, type: REPOSITORY, first: $n) {
+    nodes {
+      ... on Repository { nameWithOwner url stargazerCount forkCount }
+    }
+  }
+}
+"""
 
 # Prefer secret from Streamlit Cloud; safe get() so local runs don't crash
 secret_token: Optional[str] = st.secrets.get("GITHUB_TOKEN")
@@ -110,78 +118,212 @@ def gh_headers(token: Optional[str]):
         hdr["Authorization"] = f"token {token}"
     return hdr
 
-@st.cache_data(ttl=300)
-def fetch_top_python_repos(per_page: int = 30, token: Optional[str] = None):
-    params = {
-        "q": "language:Python",
-        "sort": "stars",
-        "order": "desc",
-        "per_page": per_page,
-        "page": 1
-    }
-    resp = requests.get(GITHUB_SEARCH_URL, params=params, headers=gh_headers(token), timeout=15)
-    resp.raise_for_status()
-    return resp.json().get("items", [])
+@st.cache_resource
+def get_client():
+    # One HTTP/2 client shared by every GitHub call: repeated headers are
+    # HPACK-compressed and concurrent requests multiplex over one connection
+    return httpx.Client(
+        http2=True,
+        headers={"Accept": "application/vnd.github.v3+json"},
+        limits=httpx.Limits(max_connections=4),
+        timeout=15,
+    )
 
-# ------------------------------------------------------
-# SIDEBAR
-# ------------------------------------------------------
-with st.sidebar:
-    # If you want to allow pasting a token locally for testing, uncomment below:
-    # local_token_input = st.text_input("GitHub token (optional, local only)", type="password")
-    per_page = st.selectbox("Number of repos", [10, 20, 30, 50], index=2)  # default 30
-    st.caption("This dashboard shows repo link, stars, and forks only.")
-    # Show whether we are using a secret token
-    if secret_token:
-        st.success("Using GITHUB_TOKEN from Streamlit secrets")
-    else:
-        st.info("No GITHUB_TOKEN found in Streamlit secrets (requests will be unauthenticated).")
-
-    # Show rate limit (best-effort)
+@st.cache_data(ttl=30)
+def get_rate_limit(token_present: bool):
+    # The counter only moves per request, so a 30s cache spares a round-trip on
+    # nearly every rerun. Keyed on whether a token is set, not the token itself.
+    resp = get_client().get(
+        GITHUB_RATE_LIMIT_URL,
+        headers=gh_headers(secret_token if token_present else None),
+        timeout=7,
+    )
+    return resp.json().get("rate", {}) if resp.is_success else {}
+
+@st.cache_resource
+def get_etag_store():
+    # (language, per_page) -> (ETag, items) from the last 200 response, so the ttl refresh
+    # below can revalidate with If-None-Match instead of re-downloading the body
+    return {}
+
+def _bad_payload(resp):
+    # A 200 with a body we cannot read (not JSON, or missing the expected keys)
+    # is surfaced as an HTTP error so render() reports it like any other failure
+    return httpx.HTTPStatusError(
+        f"Unexpected response from {resp.request.url}", request=resp.request, response=resp
+    )
+
+@st.cache_data(ttl=300, max_entries=16)
+def fetch_top_repos(language: str, per_page: int = 30, token: Optional[str] = None):
+    # GraphQL needs auth; anonymous runs keep using the REST search endpoint
+    if not token:
+        params = {
+            "q": f"language:{language}",
+            "sort": "stars",
+            "order": "desc",
+            "per_page": per_page,
+            "page": 1
+        }
+        headers = gh_headers(token)
+        etag_store = get_etag_store()
+        cached = etag_store.get((language, per_page))
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        resp = get_client().get(GITHUB_SEARCH_URL, params=params, headers=headers, timeout=15)
+        # 304 Not Modified: list unchanged, so no body to download. This path is
+        # anonymous, and GitHub still counts an unauthenticated 304 against the limit
+        if resp.status_code == 304 and cached:
+            return cached[1]
+        resp.raise_for_status()
+        # Keep only what the tiles render; the raw items carry ~70 keys each
+        try:
+            items = [
+                {
+                    "full_name": r["full_name"],
+                    "html_url": r["html_url"],
+                    "stargazers_count": r["stargazers_count"],
+                    "forks_count": r["forks_count"],
+                }
+                for r in resp.json().get("items", [])
+            ]
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise _bad_payload(resp) from e
+        if resp.headers.get("ETag"):
+            etag_store[(language, per_page)] = (resp.headers["ETag"], items)
+        return items
+
+    resp = get_client().post(
+        GITHUB_GRAPHQL_URL,
+        json={"query": TOP_REPOS_QUERY, "variables": {"q": f"language:{language} sort:stars-desc", "n": per_page}},
+        headers=gh_headers(token),
+        timeout=15,
+    )
+    resp.raise_for_status()
     try:
-        rate_resp = requests.get("https://api.github.com/rate_limit", headers=gh_headers(secret_token), timeout=7)
-        if rate_resp.ok:
-            rate = rate_resp.json().get("rate", {})
-            remaining = rate.get("remaining")
-            limit = rate.get("limit")
-            st.write(f"API rate limit: {remaining}/{limit} remaining")
-    except Exception:
-        # silently ignore rate-limit errors
-        pass
+        body = resp.json()
+        # GraphQL reports query errors with a 200 status and no data
+        if not body.get("data"):
+            message = (body.get("errors") or [{}])[0].get("message", "GraphQL query failed")
+            raise httpx.HTTPStatusError(message, request=resp.request, response=resp)
+        nodes = body["data"]["search"]["nodes"]
+        # Map back to the REST field names so the grid below is unchanged
+        return [
+            {
+                "full_name": n["nameWithOwner"],
+                "html_url": n["url"],
+                "stargazers_count": n["stargazerCount"],
+                "forks_count": n["forkCount"],
+            }
+            for n in nodes
+            if n
+        ]
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise _bad_payload(resp) from e
 
 # ------------------------------------------------------
-# FETCH DATA
+# REPO TILES
 # ------------------------------------------------------
-items = fetch_top_python_repos(per_page=per_page, token=secret_token)
+# Adjacent string literals, so the compiler joins them and a rerun only pays
+# for the name binding. Kept on one line: blank or indented lines inside the
+# batched grid would end the HTML block and get rendered as markdown code.
+TILE_TPL = (
+    '<div class="repo-tile">'
+    '<h3><a href="{url}" target="_blank" rel="noopener">{name}</a></h3>'
+    '<div style="display:flex; gap:40px; margin-top:15px;">'
+    '<div><strong>⭐ Stars</strong><br>{stars:,}</div>'
+    '<div><strong>🍴 Forks</strong><br>{forks:,}</div>'
+    '</div>'
+    '</div>'
+)
+
+# fetch_top_repos always returns these four keys, so no .get() defaults needed
+_repo_fields = itemgetter("full_name", "html_url", "stargazers_count", "forks_count")
+
+def tile_html_for(repo):
+    name, html_url, stars, forks = _repo_fields(repo)
+    return TILE_TPL.format(url=html_url, name=name, stars=stars, forks=forks)
 
 # ------------------------------------------------------
-# DISPLAY IN GRID
+# PAGE
 # ------------------------------------------------------
-cols_per_row = 2
-rows = (len(items) + cols_per_row - 1) // cols_per_row
-
-for r in range(rows):
-    cols = st.columns(cols_per_row)
-
-    for c in range(cols_per_row):
-        idx = r * cols_per_row + c
-        if idx >= len(items):
-            break
-
-        repo = items[idx]
-        name = repo.get("full_name", "")
-        html_url = repo.get("html_url", "#")
-        stars = repo.get("stargazers_count", 0)
-        forks = repo.get("forks_count", 0)
-
-        with cols[c]:
-            tile_html = f"""
-            <div class="repo-tile">
-                <h3><a href="{html_url}" target="_blank" rel="noopener">{name}</a></h3>
-                <div style="display:flex; gap:40px; margin-top:15px;">
-                    <div><strong>⭐ Stars</strong><br>{stars:,}</div>
-                    <div><strong>🍴 Forks</strong><br>{forks:,}</div>
-                </div>
-            </div>
-            """
-            st.markdown(tile_html, unsafe_allow_html=True)
+def render(
+    language: str = "Python",
+    page_title: str = "Top Python Repos",
+    heading: str = "Top Curated Python Repos for Developers",
+    subtitle: str = "Handpicked list of trending Python projects on GitHub.",
+    caption: str = "This dashboard shows repo link, stars, and forks only.",
+):
+    """Render a top-starred-repos page for one GitHub language.
+
+    Shared by the Python and SQL apps so both run the same fetch, caching and
+    grid code; only the language and the copy differ.
+    """
+    # PAGE CONFIG
+    st.set_page_config(page_title=page_title, layout="wide")
+    st.markdown(minified_css(), unsafe_allow_html=True)
+
+    # HEADER
+    st.markdown(f"<h1>{heading}</h1>", unsafe_allow_html=True)
+    st.markdown(
+        f'<div class="subtitle">{subtitle}</div>',
+        unsafe_allow_html=True
+    )
+
+    # SIDEBAR
+    with st.sidebar:
+        # If you want to allow pasting a token locally for testing, uncomment below:
+        # local_token_input = st.text_input("GitHub token (optional, local only)", type="password")
+        per_page = st.selectbox("Number of repos", [10, 20, 30, 50], index=2)  # default 30
+
+    # FETCH DATA
+    # Fire the search and the rate-limit probe together so the page waits one
+    # round-trip instead of two; worker threads inherit this run's script context.
+    with ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx, initargs=(None, get_script_run_ctx())) as ex:
+        f_items = ex.submit(fetch_top_repos, language, per_page, secret_token)
+        f_rate = ex.submit(get_rate_limit, bool(secret_token))
+
+        with st.sidebar:
+            st.caption(caption)
+            # Show whether we are using a secret token
+            if secret_token:
+                st.success("Using GITHUB_TOKEN from Streamlit secrets")
+            else:
+                st.info("No GITHUB_TOKEN found in Streamlit secrets (requests will be unauthenticated).")
+
+            # Show rate limit (best-effort)
+            try:
+                rate = f_rate.result()
+                if rate:
+                    remaining = rate.get("remaining")
+                    limit = rate.get("limit")
+                    st.write(f"API rate limit: {remaining}/{limit} remaining")
+            except Exception:
+                # silently ignore rate-limit errors
+                pass
+
+        # A failed or rate-limited search ends the run here with a message
+        # instead of a traceback
+        try:
+            items = f_items.result()
+        except httpx.HTTPError as e:
+            st.error(f"GitHub API: {e}")
+            st.stop()
+
+    if not items:
+        st.info("No repositories to display. If you expected results, check your GITHUB_TOKEN in Streamlit Secrets.")
+        st.stop()
+
+    # DISPLAY IN GRID
+    # One markdown call for the whole 2-column grid instead of one per tile
+    grid_html = (
+        '<div style="display:grid; grid-template-columns:1fr 1fr; gap:20px;">'
+        + "".join(tile_html_for(repo) for repo in items)
+        + "</div>"
+    )
+    st.markdown(grid_html, unsafe_allow_html=True)
+
+
+# Streamlit runs the page script as __main__; Top_SQL_Git_Projects.py imports
+# render() from here instead.
+if __name__ == "__main__":
+    render()
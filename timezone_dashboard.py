@@ -1,60 +1,103 @@
 # timezone_dashboard_fixed.py
 import streamlit as st
-from datetime import datetime, timedelta, timezone as _timezone
-import pytz
+from datetime import datetime, timezone as _timezone
+from zoneinfo import ZoneInfo, available_timezones
 import os
-import pandas as pd  # <- for CSV export
+import csv
+import io
 
 st.set_page_config(page_title="Dynamic Timezone Converter", layout="wide")
 
-# Prefer zoneinfo when available (Python 3.9+). Fall back to pytz where needed.
-try:
-    from zoneinfo import ZoneInfo
-    USE_ZONEINFO = True
-except Exception:
-    ZoneInfo = None
-    USE_ZONEINFO = False
-
-@st.cache_data
+@st.cache_resource
 def get_timezones():
-    # Keep the exhaustive IANA list from pytz for selection consistency
-    return list(pytz.all_timezones)
+    # Exhaustive IANA list from the system tz database; a tuple, so it is safe to share
+    return tuple(sorted(available_timezones()))
+
+@st.cache_resource
+def _tz(name):
+    # Resolve each IANA name to its tz object once. Cached to avoid repeated work.
+    return ZoneInfo(name)
+
+def in_zone(utc_dt, tzname):
+    # fromutc skips the to-UTC half of astimezone; ZoneInfo expects the
+    # target zone attached to the (UTC) wall time
+    tzobj = _tz(tzname)
+    return tzobj.fromutc(utc_dt.replace(tzinfo=tzobj))
+
+# English names in fixed order, so no locale-aware strftime("%A") per clock
+_WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
 
 def format_dt(dt):
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
+    # same output as strftime("%Y-%m-%d %H:%M:%S") without the libc call
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
 
-def tz_info_from_aware_dt(aware_dt):
-    offset = aware_dt.utcoffset()
-    if offset is None:
-        return "UTC±00:00"
-    total_seconds = int(offset.total_seconds())
+def offset_str(total_seconds):
     sign = "+" if total_seconds >= 0 else "-"
     abs_total = abs(total_seconds)
     hours = abs_total // 3600
     minutes = (abs_total % 3600) // 60
     return f"UTC{sign}{hours:02d}:{minutes:02d}"
 
-@st.cache_data
-def build_offset_map(timezones):
-    # Build a map tz -> current offset seconds. Cached to avoid repeated work.
+@st.cache_resource
+def offset_strings():
+    # Every modern offset is a 15-minute multiple in UTC-12..UTC+14, so card renders do a dict lookup
+    return {secs: offset_str(secs) for secs in range(-12 * 3600, 14 * 3600 + 1, 900)}
+
+def tz_info_from_aware_dt(aware_dt):
+    offset = aware_dt.utcoffset()
+    if offset is None:
+        return "UTC±00:00"
+    total_seconds = int(offset.total_seconds())
+    # historical (LMT) offsets in manual mode fall outside the table
+    return offset_strings().get(total_seconds) or offset_str(total_seconds)
+
+@st.cache_resource
+def get_offset_map():
+    # tz -> current offset seconds and offset -> [tz, ...]; built on the first run for the picker labels
+    timezones = get_timezones()
     m = {}
-    now_utc = datetime.utcnow()
+    offset_to_zones = {}
+    # one UTC instant for every zone; note tzinfo.utcoffset() expects local
+    # wall time, so go through fromutc() rather than passing now_utc to it
+    now_utc = datetime.now(_timezone.utc).replace(tzinfo=None)
     for tz in timezones:
         try:
-            if USE_ZONEINFO:
-                tzobj = ZoneInfo(tz)
-                aware = now_utc.replace(tzinfo=ZoneInfo('UTC')).astimezone(tzobj)
-            else:
-                tzobj = pytz.timezone(tz)
-                aware = datetime.now(tzobj)
-            off = aware.utcoffset()
+            off = in_zone(now_utc, tz).utcoffset()
             m[tz] = int(off.total_seconds()) if off is not None else None
         except Exception:
             m[tz] = None
-    return m
+        if m[tz] is not None:
+            offset_to_zones.setdefault(m[tz], []).append(tz)
+    return m, offset_to_zones
+
+@st.cache_resource
+def build_labels():
+    # tz -> "tz (UTC±HH:MM)" for the Other Clocks picker; no arguments, so nothing to hash per rerun
+    offset_map, _ = get_offset_map()
+    strings = offset_strings()
+    labels = {}
+    for tz, sec in offset_map.items():
+        if sec is None:
+            labels[tz] = tz
+        else:
+            labels[tz] = f"{tz} ({strings.get(sec) or offset_str(sec)})"
+    return labels
+
+def targets_excluding(source_tz_name):
+    # every zone but the home clock: two slices of the immutable tuple instead
+    # of filtering ~600 names each rerun
+    timezones = get_timezones()
+    i = timezones.index(source_tz_name)
+    return timezones[:i] + timezones[i + 1:]
 
 # Detection heuristics for local timezone
-def detect_local_timezone_candidate(timezones, offset_map):
+def detect_local_timezone_candidate(timezones):
+    # one OS tz lookup shared by steps 3-5
+    try:
+        local_aware = datetime.now().astimezone()
+    except Exception:
+        local_aware = None
+
     # 1) env override
     env_tz = os.environ.get("DEFAULT_SOURCE_TZ")
     if env_tz and env_tz in timezones:
@@ -79,7 +122,6 @@ def detect_local_timezone_candidate(timezones, offset_map):
 
     # 3) try astimezone() attributes
     try:
-        local_aware = datetime.now().astimezone()
         tzinfo = local_aware.tzinfo
         if tzinfo is not None:
             for attr in ("zone", "key"):
@@ -104,7 +146,7 @@ def detect_local_timezone_candidate(timezones, offset_map):
         "PST": "America/Los_Angeles",
     }
     try:
-        local_abbr = datetime.now().astimezone().tzname()
+        local_abbr = local_aware.tzname()
         if local_abbr and local_abbr in abbrev_map:
             cand = abbrev_map[local_abbr]
             if cand in timezones:
@@ -112,12 +154,13 @@ def detect_local_timezone_candidate(timezones, offset_map):
     except Exception:
         pass
 
-    # 5) match by current UTC offset using cached offset_map
+    # 5) match by current UTC offset using the cached offset -> zones index
     try:
-        local_offset = datetime.now().astimezone().utcoffset()
+        local_offset = local_aware.utcoffset()
         if local_offset is not None:
             local_seconds = int(local_offset.total_seconds())
-            matches = [tz for tz, sec in offset_map.items() if sec == local_seconds]
+            _, offset_to_zones = get_offset_map()
+            matches = offset_to_zones.get(local_seconds, [])
             # prefer Asia/Kolkata for systems in that offset if present
             for prefer in ("Asia/Kolkata",):
                 if prefer in matches:
@@ -134,27 +177,16 @@ def detect_local_timezone_candidate(timezones, offset_map):
 
 # helper: create aware datetime for a given zone name from naive dt
 def make_aware_from_naive(naive_dt, tzname):
-    if USE_ZONEINFO:
-        tzobj = ZoneInfo(tzname)
-        # create aware with fold control — caller may set fold
-        aware = naive_dt.replace(tzinfo=tzobj)
-        return aware
-    else:
-        tzobj = pytz.timezone(tzname)
-        try:
-            aware = tzobj.localize(naive_dt, is_dst=None)
-        except (pytz.AmbiguousTimeError, pytz.NonExistentTimeError):
-            # let caller handle ambiguity by trying True/False
-            raise
-        return aware
+    tzobj = _tz(tzname)
+    # create aware with fold control — caller may set fold
+    aware = naive_dt.replace(tzinfo=tzobj)
+    return aware
 
 # UI start
 st.title("Dynamic Timezone Converter")
 
 timezones = get_timezones()
-offset_map = build_offset_map(timezones)
-
-default_source_tz, detect_path = detect_local_timezone_candidate(timezones, offset_map)
+default_source_tz, detect_path = detect_local_timezone_candidate(timezones)
 
 with st.sidebar:
     st.title("Time Conversion Mode Selector")
@@ -173,113 +205,79 @@ with st.expander("Clock Settings", expanded=True):
         )
     with col2:
         # show simple labels including current offset for better discoverability
-        def label_for(tz):
-            sec = offset_map.get(tz)
-            if sec is None:
-                return tz
-            h = sec // 3600
-            m = abs((sec % 3600) // 60)
-            sign = "+" if sec >= 0 else "-"
-            return f"{tz} (UTC{sign}{abs(h):02d}:{m:02d})"
-
-        available_targets = [tz for tz in timezones if tz != source_tz_name]
-        target_tz_names = st.multiselect("Other Clocks", available_targets, format_func=lambda x: label_for(x))
+        labels = build_labels()
+        available_targets = targets_excluding(source_tz_name)
+        target_tz_names = st.multiselect("Other Clocks", available_targets, format_func=lambda x: labels.get(x, x))
 
 # choose source tzobj
-if USE_ZONEINFO:
-    source_tz = ZoneInfo(source_tz_name)
-else:
-    source_tz = pytz.timezone(source_tz_name)
+source_tz = _tz(source_tz_name)
 
 st.markdown("## Clock Conversion")
 left_col, right_col = st.columns([1, 1.4])
 
-def render_card(container, title, aware_dt, tzname):
-    # aware_dt is timezone-aware datetime
-    if USE_ZONEINFO:
-        tzobj = ZoneInfo(tzname)
-        dt_in_tz = aware_dt.astimezone(tzobj)
-    else:
-        tzobj = pytz.timezone(tzname)
-        dt_in_tz = aware_dt.astimezone(tzobj)
+CSV_COLUMNS = ("Label", "Timezone", "Abbrev", "Local Time", "Weekday", "ISO", "Epoch", "Offset")
+
+def csv_row(label, tzname, dt, epoch):
+    return (
+        label,
+        tzname,
+        dt.tzname(),
+        format_dt(dt),
+        _WEEKDAYS[dt.weekday()],
+        dt.isoformat(),
+        epoch,
+        tz_info_from_aware_dt(dt),
+    )
+
+@st.cache_data(max_entries=64)
+def build_csv(source_tz_name, epoch, targets):
+    # Keyed on the instant and the selected clocks, so reruns with unchanged
+    # inputs skip the CSV work; returns bytes for download_button. Rows are
+    # streamed through csv.writer, no DataFrame needed for a handful of rows.
+    utc_dt = datetime.fromtimestamp(epoch, _timezone.utc).replace(tzinfo=None)
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    writer.writerow(csv_row("Home Clock", source_tz_name, in_zone(utc_dt, source_tz_name), epoch))
+    writer.writerows(csv_row("Target Clock", tgt_name, in_zone(utc_dt, tgt_name), epoch) for tgt_name in targets)
+    return buf.getvalue().encode("utf-8")
+
+def card_markdown(tzname, epoch, title):
+    # One markdown block per card instead of one element per field
+    utc_dt = datetime.fromtimestamp(epoch, _timezone.utc).replace(tzinfo=None)
+    dt_in_tz = in_zone(utc_dt, tzname)
 
     abbrev = dt_in_tz.tzname() or ""
     offset = tz_info_from_aware_dt(dt_in_tz)
-    weekday = dt_in_tz.strftime('%A')
+    weekday = _WEEKDAYS[dt_in_tz.weekday()]
+
+    return "\n\n".join([
+        f"**{title}**",
+        f"**Timezone:** {tzname} ({abbrev})",
+        f"**Local time:** {format_dt(dt_in_tz)}",
+        f"**Weekday:** {weekday}",
+        f"**Offset:** {offset}",
+        "---",
+    ])
 
-    with container:
-        st.markdown(f"**{title}**")
-        st.write(f"**Timezone:** {tzname} ({abbrev})")
-        st.write(f"**Local time:** {format_dt(dt_in_tz)}")
-        st.write(f"**Weekday:** {weekday}")
-        st.write(f"**Offset:** {offset}")
-        st.write("---")
+def render_card(container, title, epoch, tzname):
+    # epoch is the instant shown by every clock, in whole seconds
+    container.markdown(card_markdown(tzname, epoch, title))
 
 if mode == "Current Time Conversion":
     st.subheader("🕒 Current Time Conversion")
-    if USE_ZONEINFO:
-        source_now = datetime.now(ZoneInfo('UTC')).astimezone(source_tz)
-    else:
-        source_now = datetime.now(source_tz)
-
-    left_col.markdown("### Home Clock")
-    render_card(left_col, f"Current time in {source_tz_name}", source_now, source_tz_name)
-
-    right_col.markdown("### Other Clocks")
-    if not target_tz_names:
-        right_col.info("Select one or more Other Clocks in the 'Clock Settings' above.")
-    else:
-        # build CSV-able data while rendering (include home clock as first row)
-        rows = []
-
-        # home clock row
-        rows.append({
-            "Label": "Home Clock",
-            "Timezone": source_tz_name,
-            "Abbrev": source_now.tzname(),
-            "Local Time": format_dt(source_now),
-            "Weekday": source_now.strftime('%A'),
-            "ISO": source_now.isoformat(),
-            "Epoch": int(source_now.timestamp()),
-            "Offset": tz_info_from_aware_dt(source_now),
-        })
-
-        for tgt_name in target_tz_names:
-            # render card
-            render_card(right_col, f"{tgt_name}", source_now, tgt_name)
-            # collect row
-            if USE_ZONEINFO:
-                dt_in_tgt = source_now.astimezone(ZoneInfo(tgt_name))
-            else:
-                dt_in_tgt = source_now.astimezone(pytz.timezone(tgt_name))
-            rows.append({
-                "Label": "Target Clock",
-                "Timezone": tgt_name,
-                "Abbrev": dt_in_tgt.tzname(),
-                "Local Time": format_dt(dt_in_tgt),
-                "Weekday": dt_in_tgt.strftime('%A'),
-                "ISO": dt_in_tgt.isoformat(),
-                "Epoch": int(dt_in_tgt.timestamp()),
-                "Offset": tz_info_from_aware_dt(dt_in_tgt),
-            })
-
-        if rows:
-            df = pd.DataFrame(rows)
-            csv_data = df.to_csv(index=False)
-            right_col.download_button(
-                label="⬇️ Download CSV (All Clocks)",
-                data=csv_data,
-                file_name="all_clocks_current_conversion.csv",
-                mime="text/csv",
-            )
+    source_dt = datetime.now(source_tz)
+
+    home_heading = "### Home Clock"
+    home_title = f"Current time in {source_tz_name}"
+    targets_heading = "### Other Clocks"
+    target_suffix = ""
+    csv_file_name = "all_clocks_current_conversion.csv"
 
 else:
     st.subheader("🧭 Manual Time Conversion")
     # present defaults in local source timezone
-    if USE_ZONEINFO:
-        now_in_source = datetime.now(ZoneInfo('UTC')).astimezone(source_tz)
-    else:
-        now_in_source = datetime.now(source_tz)
+    now_in_source = datetime.now(source_tz)
 
     now_local_naive = now_in_source.replace(tzinfo=None)
     default_date = now_local_naive.date()
@@ -295,95 +293,55 @@ else:
     localized_source_dt = None
 
     # attempt to create an aware datetime; detect ambiguity and offer choice when possible
-    if USE_ZONEINFO:
-        try:
-            # create two variants with fold=0 and fold=1 and compare offsets
-            aware0 = chosen_dt_naive.replace(tzinfo=ZoneInfo(source_tz_name), fold=0)
-            aware1 = chosen_dt_naive.replace(tzinfo=ZoneInfo(source_tz_name), fold=1)
-            off0 = aware0.utcoffset()
-            off1 = aware1.utcoffset()
-            if off0 != off1:
-                ambiguous = True
-                ambiguity_note = "Ambiguous local time (DST transition). Choose interpretation:"
-                choice = st.radio(ambiguity_note, ["Earlier (fold=0)", "Later (fold=1)"], index=0)
-                localized_source_dt = aware0 if choice.startswith("Earlier") else aware1
-            else:
-                # not ambiguous — use default
-                localized_source_dt = aware0
-        except Exception:
-            # fallback: naive attach
-            localized_source_dt = chosen_dt_naive.replace(tzinfo=ZoneInfo(source_tz_name))
-    else:
-        tzobj = pytz.timezone(source_tz_name)
-        try:
-            localized_source_dt = tzobj.localize(chosen_dt_naive, is_dst=None)
-        except pytz.AmbiguousTimeError:
-            ambiguous = True
-            ambiguity_note = "Ambiguous local time (DST). Choose interpretation:"
-            choice = st.radio(ambiguity_note, ["Earlier (is_dst=False)", "Later (is_dst=True)"], index=0)
-            try:
-                localized_source_dt = tzobj.localize(chosen_dt_naive, is_dst=(True if choice.endswith("True)") else False))
-            except Exception:
-                # final fallback: pick is_dst=False
-                localized_source_dt = tzobj.localize(chosen_dt_naive, is_dst=False)
-        except pytz.NonExistentTimeError:
+    # zoneinfo resolves DST gaps/overlaps through fold, so no localize() dance
+    try:
+        # create two variants with fold=0 and fold=1 and compare offsets
+        aware0 = chosen_dt_naive.replace(tzinfo=source_tz, fold=0)
+        aware1 = chosen_dt_naive.replace(tzinfo=source_tz, fold=1)
+        off0 = aware0.utcoffset()
+        off1 = aware1.utcoffset()
+        if off0 != off1:
             ambiguous = True
-            ambiguity_note = "Non-existent local time (clock jumped). Choose a fallback:"
-            choice = st.radio(ambiguity_note, ["Shift forward 1 hour", "Shift backward 1 hour"], index=0)
-            if choice.startswith("Shift forward"):
-                fallback = chosen_dt_naive + timedelta(hours=1)
-            else:
-                fallback = chosen_dt_naive - timedelta(hours=1)
-            localized_source_dt = tzobj.localize(fallback, is_dst=False)
-
-    left_col.markdown("### Home Clock (chosen time)")
-    render_card(left_col, f"Chosen time in {source_tz_name}", localized_source_dt, source_tz_name)
-
-    right_col.markdown("### Converted Other Clocks")
-    if not target_tz_names:
-        right_col.info("Select one or more Other Clocks in the 'Clock Settings' above.")
-    else:
-        # collect rows for CSV while rendering (include home clock first)
-        rows = []
-
-        # home clock row
-        rows.append({
-            "Label": "Home Clock",
-            "Timezone": source_tz_name,
-            "Abbrev": localized_source_dt.tzname(),
-            "Local Time": format_dt(localized_source_dt),
-            "Weekday": localized_source_dt.strftime('%A'),
-            "ISO": localized_source_dt.isoformat(),
-            "Epoch": int(localized_source_dt.timestamp()),
-            "Offset": tz_info_from_aware_dt(localized_source_dt),
-        })
-
-        for tgt_name in target_tz_names:
-            render_card(right_col, f"{tgt_name} (converted)", localized_source_dt, tgt_name)
-            if USE_ZONEINFO:
-                dt_in_tgt = localized_source_dt.astimezone(ZoneInfo(tgt_name))
-            else:
-                dt_in_tgt = localized_source_dt.astimezone(pytz.timezone(tgt_name))
-            rows.append({
-                "Label": "Target Clock",
-                "Timezone": tgt_name,
-                "Abbrev": dt_in_tgt.tzname(),
-                "Local Time": format_dt(dt_in_tgt),
-                "Weekday": dt_in_tgt.strftime('%A'),
-                "ISO": dt_in_tgt.isoformat(),
-                "Epoch": int(dt_in_tgt.timestamp()),
-                "Offset": tz_info_from_aware_dt(dt_in_tgt),
-            })
-
-        if rows:
-            df = pd.DataFrame(rows)
-            csv_data = df.to_csv(index=False)
-            right_col.download_button(
-                label="⬇️ Download CSV (All Clocks)",
-                data=csv_data,
-                file_name="all_clocks_manual_conversion.csv",
-                mime="text/csv",
-            )
+            ambiguity_note = "Ambiguous local time (DST transition). Choose interpretation:"
+            choice = st.radio(ambiguity_note, ["Earlier (fold=0)", "Later (fold=1)"], index=0)
+            localized_source_dt = aware0 if choice.startswith("Earlier") else aware1
+        else:
+            # not ambiguous — use default
+            localized_source_dt = aware0
+    except Exception:
+        # fallback: naive attach
+        localized_source_dt = chosen_dt_naive.replace(tzinfo=source_tz)
+
+    source_dt = localized_source_dt
+
+    home_heading = "### Home Clock (chosen time)"
+    home_title = f"Chosen time in {source_tz_name}"
+    targets_heading = "### Converted Other Clocks"
+    target_suffix = " (converted)"
+    csv_file_name = "all_clocks_manual_conversion.csv"
+
+# Both modes render the same cards and CSV; they differ only in the home
+# instant and the copy set above
+epoch = int(source_dt.timestamp())
+
+left_col.markdown(home_heading)
+render_card(left_col, home_title, epoch, source_tz_name)
+
+right_col.markdown(targets_heading)
+if not target_tz_names:
+    right_col.info("Select one or more Other Clocks in the 'Clock Settings' above.")
+else:
+    for tgt_name in target_tz_names:
+        render_card(right_col, f"{tgt_name}{target_suffix}", epoch, tgt_name)
+
+    # CSV includes the home clock as the first row
+    csv_data = build_csv(source_tz_name, epoch, tuple(target_tz_names))
+    right_col.download_button(
+        label="⬇️ Download CSV (All Clocks)",
+        data=csv_data,
+        file_name=csv_file_name,
+        mime="text/csv",
+    )
 
 st.markdown("---")
 st.caption("Tip: CSV includes Home Clock + Target Clocks, with ISO & epoch columns for easy import.")
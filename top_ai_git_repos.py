@@ -1,8 +1,19 @@
 # ai_top_repos.py
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from typing import Optional
 
+# orjson parses the search payload several times faster; fall back to stdlib json
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
 # ------------------------------------------------------
 # PAGE CONFIG
 # ------------------------------------------------------
@@ -42,7 +53,17 @@ st.markdown(
 # ------------------------------------------------------
 # GITHUB API HELPERS
 # ------------------------------------------------------
-GITHUB_SEARCH_URL = "https://api.github.com/search/repositories"
+
+# NOTE: API does not accept OR between topic: qualifiers; use space-separated qualifiers.
+# Pre-encoded search for
+#   q="topic:ai topic:artificial-intelligence topic:machine-learning topic:deep-learning"
+#   sort=stars, order=desc
+# kept as a literal so reruns do no encoding; fetch_ai_repos only appends the paging params
+AI_SEARCH_URL = (
+    "https://api.github.com/search/repositories"
+    "?q=topic%3Aai+topic%3Aartificial-intelligence+topic%3Amachine-learning+topic%3Adeep-learning"
+    "&sort=stars&order=desc"
+)
 
 # safe read from secrets (works on Streamlit Cloud); returns None if missing
 secret_token: Optional[str] = st.secrets.get("GITHUB_TOKEN")
@@ -53,24 +74,42 @@ def gh_headers(token: Optional[str]):
         hdr["Authorization"] = f"token {token}"
     return hdr
 
+@st.cache_resource
+def gh_session():
+    # Shared keep-alive session so the search and rate-limit calls reuse one
+    # TLS connection instead of each opening their own
+    s = requests.Session()
+    s.headers.update({"Accept": "application/vnd.github.v3+json"})
+    s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return s
+
+@st.cache_data(ttl=60)
+def get_rate(token: Optional[str] = None):
+    # At most one rate-limit round trip per minute instead of one per rerun
+    r = gh_session().get("https://api.github.com/rate_limit", headers=gh_headers(token), timeout=7)
+    return r.json().get("rate", {}) if r.ok else {}
+
+@st.cache_resource
+def etag_store():
+    # per_page -> (ETag, items) from the last 200, so the next ttl refresh can
+    # revalidate with If-None-Match and get an empty 304 when nothing changed
+    return {}
+
 @st.cache_data(ttl=300)
 def fetch_ai_repos(per_page: int = 30, token: Optional[str] = None):
     """
     Fetch topic-based AI repos. Returns list of repo dicts or [] on error.
     Uses an API-compatible topic query (space-separated topic: qualifiers).
     """
-    # NOTE: API does not accept OR between topic: qualifiers; use space-separated qualifiers.
-    q = "topic:ai topic:artificial-intelligence topic:machine-learning topic:deep-learning"
-    params = {
-        "q": q,
-        "sort": "stars",
-        "order": "desc",
-        "per_page": per_page,
-        "page": 1,
-    }
+    url = f"{AI_SEARCH_URL}&per_page={per_page}&page=1"
+
+    headers = gh_headers(token)
+    cached = etag_store().get(per_page)
+    if cached:
+        headers["If-None-Match"] = cached[0]
 
     try:
-        resp = requests.get(GITHUB_SEARCH_URL, params=params, headers=gh_headers(token), timeout=15)
+        resp = gh_session().get(url, headers=headers, timeout=15)
     except requests.RequestException as e:
         # Network-level failure
         st.error("Network error while contacting GitHub API.")
@@ -78,6 +117,10 @@ def fetch_ai_repos(per_page: int = 30, token: Optional[str] = None):
         st.exception(e)
         return []
 
+    # Not modified since the last fetch: reuse the stored items
+    if resp.status_code == 304 and cached:
+        return cached[1]
+
     # Handle API-level errors gracefully
     if not resp.ok:
         # attempt to parse GitHub's message
@@ -94,42 +137,47 @@ def fetch_ai_repos(per_page: int = 30, token: Optional[str] = None):
 
     # parse JSON safely
     try:
-        items = resp.json().get("items", [])
+        items = _loads(resp.content).get("items", [])
     except Exception as e:
         st.error("Failed to parse GitHub response.")
         st.exception(e)
         return []
 
+    if resp.headers.get("ETag"):
+        etag_store()[per_page] = (resp.headers["ETag"], items)
     return items
 
 # ------------------------------------------------------
-# SIDEBAR (controls + status)
+# SIDEBAR (controls + status) + FETCH REPOS (safe)
 # ------------------------------------------------------
-with st.sidebar:
-    per_page = st.selectbox("Number of repos", [10, 20, 30, 50], index=2)  # default 30
-    st.caption("Showing repo link, stars, and forks only.")
-
-    if secret_token:
-        st.success("Using GITHUB_TOKEN from Streamlit secrets")
-    else:
-        st.info("No GITHUB_TOKEN found — requests are anonymous and may be rate-limited.")
-
-    # Attempt to show rate limit info
-    try:
-        rl = requests.get("https://api.github.com/rate_limit", headers=gh_headers(secret_token), timeout=7)
-        if rl.ok:
-            rate = rl.json().get("rate", {})
-            st.write(f"API rate limit: {rate.get('remaining')}/{rate.get('limit')} remaining")
+# The rate-limit probe and the search run on worker threads (which inherit
+# this run's script context), so the page waits max(a, b) instead of a + b.
+with ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx, initargs=(None, get_script_run_ctx())) as ex:
+    # needs no widget input, so start it before the sidebar is drawn
+    f_rate = ex.submit(get_rate, secret_token)
+
+    with st.sidebar:
+        per_page = st.selectbox("Number of repos", [10, 20, 30, 50], index=2)  # default 30
+        f_items = ex.submit(fetch_ai_repos, per_page=per_page, token=secret_token)
+        st.caption("Showing repo link, stars, and forks only.")
+
+        if secret_token:
+            st.success("Using GITHUB_TOKEN from Streamlit secrets")
         else:
-            st.write("Rate limit info not available.")
-    except Exception:
-        # quiet fail
-        pass
+            st.info("No GITHUB_TOKEN found — requests are anonymous and may be rate-limited.")
 
-# ------------------------------------------------------
-# FETCH REPOS (safe)
-# ------------------------------------------------------
-items = fetch_ai_repos(per_page=per_page, token=secret_token)
+        # Attempt to show rate limit info
+        try:
+            rate = f_rate.result()
+            if rate:
+                st.write(f"API rate limit: {rate.get('remaining')}/{rate.get('limit')} remaining")
+            else:
+                st.write("Rate limit info not available.")
+        except Exception:
+            # quiet fail
+            pass
+
+    items = f_items.result()
 
 if not items:
     st.info("No repositories to display. If you expected results, check your GITHUB_TOKEN in Streamlit Secrets or view app logs.")
@@ -138,30 +186,26 @@ if not items:
 # ------------------------------------------------------
 # RENDER GRID
 # ------------------------------------------------------
-cols_per_row = 2
-rows = (len(items) + cols_per_row - 1) // cols_per_row
-
-for r in range(rows):
-    cols = st.columns(cols_per_row)
-    for c in range(cols_per_row):
-        idx = r * cols_per_row + c
-        if idx >= len(items):
-            break
-
-        repo = items[idx]
-        name = repo.get("full_name", "")
-        html_url = repo.get("html_url", "#")
-        stars = repo.get("stargazers_count", 0)
-        forks = repo.get("forks_count", 0)
-
-        with cols[c]:
-            tile_html = f"""
-            <div class="repo-tile">
-                <h3><a href="{html_url}" target="_blank" rel="noopener">{name}</a></h3>
-                <div style="display:flex; gap:40px; margin-top:15px;">
-                    <div><strong>⭐ Stars</strong><br>{stars:,}</div>
-                    <div><strong>🍴 Forks</strong><br>{forks:,}</div>
-                </div>
-            </div>
-            """
-            st.markdown(tile_html, unsafe_allow_html=True)
+def tile_html_for(repo):
+    name = repo.get("full_name", "")
+    html_url = repo.get("html_url", "#")
+    stars = repo.get("stargazers_count", 0)
+    forks = repo.get("forks_count", 0)
+    # single line: blank/indented lines would end the HTML block in the grid
+    return (
+        f'<div class="repo-tile">'
+        f'<h3><a href="{html_url}" target="_blank" rel="noopener">{name}</a></h3>'
+        f'<div style="display:flex; gap:40px; margin-top:15px;">'
+        f'<div><strong>⭐ Stars</strong><br>{stars:,}</div>'
+        f'<div><strong>🍴 Forks</strong><br>{forks:,}</div>'
+        f'</div>'
+        f'</div>'
+    )
+
+# One markdown call for the whole 2-column grid instead of one per tile
+grid_html = (
+    '<div style="display:grid; grid-template-columns:1fr 1fr; gap:20px;">'
+    + "".join(tile_html_for(repo) for repo in items)
+    + "</div>"
+)
+st.markdown(grid_html, unsafe_allow_html=True)